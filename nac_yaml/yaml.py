@@ -5,7 +5,10 @@ import importlib.util
 import logging
 import os
 import subprocess  # nosec B404
-from collections import defaultdict
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
 
@@ -13,11 +16,18 @@ from ruamel import yaml
 
 logger = logging.getLogger(__name__)
 
+# Duplicate check results per list object, keyed by id() and only active while
+# load_yaml_files() is running. Entries keep a reference to the list, so ids
+# cannot be reused, and the list length observed at scan time.
+_duplicates_cache: ContextVar[dict[int, tuple[list[Any], int, bool]] | None] = (
+    ContextVar("_duplicates_cache", default=None)
+)
+
 
 class VaultTag(yaml.YAMLObject):
     """Custom YAML tag handler for Ansible Vault encrypted values.
 
-    Handles !vault tags in YAML files by decrypting them using ansible-vault CLI.
+    Handles !vault tags in YAML files by decrypting them using ansible-vault.
 
     Attributes:
         yaml_tag: The YAML tag string "!vault"
@@ -33,8 +43,8 @@ class VaultTag(yaml.YAMLObject):
           663662346662316662616662346662316...
 
     Security:
-        - Requires ansible-vault CLI tool to be installed
-        - Uses subprocess to call ansible-vault decrypt
+        - Decrypts in-process using ansible.parsing.vault if ansible-core is importable
+        - Otherwise requires ansible-vault CLI tool and calls ansible-vault decrypt
         - Vault password must be provided via environment variable
     """
 
@@ -55,25 +65,10 @@ class VaultTag(yaml.YAMLObject):
             Decrypted string if successful, empty string if vault spec not found
 
         Raises:
+            AnsibleError: If in-process decryption fails
             CalledProcessError: If ansible-vault decrypt fails
         """
-        spec = importlib.util.find_spec("nac_yaml.ansible_vault")
-        if spec:
-            if "ANSIBLE_VAULT_ID" in os.environ:
-                vault_id = os.environ["ANSIBLE_VAULT_ID"] + "@" + str(spec.origin)
-            else:
-                vault_id = str(spec.origin)
-            t = subprocess.check_output(  # nosec B603, B607
-                [
-                    "ansible-vault",
-                    "decrypt",
-                    "--vault-id",
-                    vault_id,
-                ],
-                input=self.value.encode(),
-            )
-            return t.decode()
-        return ""
+        return _VaultDecryptor().decrypt([self.value])[self.value]
 
     @classmethod
     def from_yaml(cls, loader: Any, node: Any) -> str:
@@ -89,6 +84,122 @@ class VaultTag(yaml.YAMLObject):
         return str(cls(node.value))
 
 
+class _VaultDecryptor:
+    """Decrypts vault encrypted values, reusing one vault secret for all of them.
+
+    Uses the in-process ansible vault library if available, so the vault
+    secret is resolved once, on first use, instead of spawning a subprocess
+    per value. Falls back to the ansible-vault CLI otherwise.
+
+    Attributes:
+        decrypted: Decrypted strings per encrypted content
+    """
+
+    def __init__(self) -> None:
+        """Initialize the decryptor without resolving the vault secret yet."""
+        self.decrypted: dict[str, str] = {}
+        self._vault: Any = None
+
+    def decrypt(self, values: list[str]) -> dict[str, str]:
+        """Decrypt a batch of vault encrypted values.
+
+        Args:
+            values: Encrypted vault content strings
+
+        Returns:
+            Mapping of encrypted content to decrypted string
+
+        Raises:
+            AnsibleError: If in-process decryption fails
+            CalledProcessError: If ansible-vault decrypt fails
+        """
+        missing = [v for v in dict.fromkeys(values) if v not in self.decrypted]
+        if not missing:
+            return self.decrypted
+        spec = importlib.util.find_spec("nac_yaml.ansible_vault")
+        if not spec:
+            self.decrypted.update(dict.fromkeys(missing, ""))
+            return self.decrypted
+
+        if self._vault is None and importlib.util.find_spec("ansible") is not None:
+            from ansible.parsing.dataloader import DataLoader
+            from ansible.parsing.vault import VaultLib, get_file_vault_secret
+
+            # Resolve the secret the same way "--vault-id <id>@<file>" does
+            vault_id = os.environ.get("ANSIBLE_VAULT_ID", "default")
+            secret = get_file_vault_secret(
+                filename=str(spec.origin), vault_id=vault_id, loader=DataLoader()
+            )
+            secret.load()
+            self._vault = VaultLib([(vault_id, secret)])
+        if self._vault is not None:
+            for v in missing:
+                self.decrypted[v] = self._vault.decrypt(v.encode()).decode()
+            return self.decrypted
+
+        if "ANSIBLE_VAULT_ID" in os.environ:
+            vault_id = os.environ["ANSIBLE_VAULT_ID"] + "@" + str(spec.origin)
+        else:
+            vault_id = str(spec.origin)
+        for v in missing:
+            t = subprocess.check_output(  # nosec B603, B607
+                [
+                    "ansible-vault",
+                    "decrypt",
+                    "--vault-id",
+                    vault_id,
+                ],
+                input=v.encode(),
+            )
+            self.decrypted[v] = t.decode()
+        return self.decrypted
+
+
+def _construct_deferred_vault(constructor: Any, node: Any) -> VaultTag:
+    """Construct a !vault value without decrypting it, see _decrypt_vault_tags().
+
+    Args:
+        constructor: YAML constructor instance
+        node: YAML node containing vault content
+
+    Returns:
+        VaultTag holding the encrypted value
+    """
+    return VaultTag(node.value)
+
+
+def _decrypt_vault_tags(data: Any, decryptor: _VaultDecryptor) -> Any:
+    """Replace all VaultTag instances in a loaded structure with plaintext.
+
+    Args:
+        data: Loaded YAML structure (modified in-place)
+        decryptor: Decryptor shared by all files of a load
+
+    Returns:
+        The structure with decrypted values, or the decrypted string if
+        data itself is a VaultTag
+    """
+    locations: list[tuple[Any, Any, VaultTag]] = []
+    stack = [data] if isinstance(data, dict | list) else []
+    while stack:
+        node = stack.pop()
+        children = node.items() if isinstance(node, dict) else enumerate(node)
+        for k, v in children:
+            if isinstance(v, VaultTag):
+                locations.append((node, k, v))
+            elif isinstance(v, dict | list):
+                stack.append(v)
+
+    if isinstance(data, VaultTag):
+        return decryptor.decrypt([data.value])[data.value]
+    if not locations:
+        return data
+    decrypted = decryptor.decrypt([tag.value for _, _, tag in locations])
+    for container, k, tag in locations:
+        container[k] = decrypted[tag.value]
+    return data
+
+
 class EnvTag(yaml.YAMLObject):
     """Custom YAML tag handler for environment variable substitution.
 
@@ -160,6 +271,10 @@ def load_yaml_files(
              Use ``"safe"`` to load native Python types (dict/list) instead of round-trip
              containers.
 
+             By default ruamel.yaml's ``"safe"`` loader uses the LibYAML based C parser
+             when ``ruamel.yaml.clib`` is installed, which is faster than the round-trip
+             loader.
+
              Caveat: when ``typ`` is not round-trip (e.g. ``"safe"``), formatting-related
              options like ``preserve_quotes`` do not apply and comments/quoting/style are not
              preserved.
@@ -200,37 +315,163 @@ def load_yaml_files(
         Result: devices: [{name: switch1}, {name: switch1}, {name: switch1, port: 1/0/1}]  # all preserved
     """
     # Create YAML parser once and reuse for all files
-    y = yaml.YAML(typ=typ) if typ is not None else yaml.YAML()
-    y.preserve_quotes = True
-    y.register_class(VaultTag)
+    if typ is None or typ == "rt":
+        y = yaml.YAML(typ=typ) if typ is not None else yaml.YAML()
+        y.preserve_quotes = True
+    else:
+        # preserve_quotes only applies to the round-trip loader
+        y = yaml.YAML(typ=typ)
+    # Vault values are decrypted after parsing, all values of a file in one
+    # batch. add_constructor() registers on the constructor class, so a
+    # subclass keeps this from affecting other loaders.
+    y.Constructor = type("_DeferredVaultConstructor", (y.Constructor,), {})
+    y.Constructor.add_constructor(VaultTag.yaml_tag, _construct_deferred_vault)
     y.register_class(EnvTag)
+    decryptor = _VaultDecryptor()
+
+    def _parse_and_merge(data_yaml: bytes, data: dict[str, Any]) -> None:
+        loaded = _decrypt_vault_tags(y.load(data_yaml), decryptor)
+        if loaded is None:
+            return
+        if not isinstance(loaded, dict):
+            raise yaml.YAMLError(
+                f"Top level of document is not a mapping: {type(loaded).__name__}"
+            )
+        merge_dict(loaded, data, deduplicate)
 
-    def _load_file(file_path: Path, data: dict[str, Any]) -> None:
-        with open(file_path) as file:
-            if file_path.suffix in [".yaml", ".yml"]:
-                data_yaml = file.read()
-                dict = y.load(data_yaml)
-                merge_dict(dict, data, deduplicate)
-
-    result: dict[str, Any] = {}
+    # Enumerate all files up front, flagging the ones found by walking a directory
+    # Non-YAML files are skipped here, so they are never opened
+    files: list[tuple[str | Path, bool]] = []
+    sizes: list[int] = []
     for path in paths:
         if os.path.isfile(path):
-            _load_file(path, result)
+            if _is_yaml_file(path):
+                files.append((path, False))
+                sizes.append(os.path.getsize(path))
         else:
-            for dir, _subdir, files in os.walk(path):
-                for filename in files:
+            for entry in _walk_files(path):
+                if _is_yaml_file(entry.name):
+                    files.append((entry.path, True))
+                    sizes.append(_file_size(entry))
+
+    # Read files concurrently, but parse and merge them sequentially in order
+    result: dict[str, Any] = {}
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    token = _duplicates_cache.set({})
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Only the contents of the next files in order are held in memory
+            window = max_workers * 2
+            futures: dict[int, Future[bytes]] = {}
+            submitted = 0
+            try:
+                for i, (file_path, walked) in enumerate(files):
+                    if len(futures) <= max_workers and submitted < len(files):
+                        # Largest files first, so they do not finish reading last
+                        batch = range(submitted, min(len(files), i + window))
+                        for j in sorted(batch, key=sizes.__getitem__, reverse=True):
+                            futures[j] = executor.submit(_read_file, files[j][0])
+                        submitted = batch.stop
                     try:
-                        _load_file(Path(dir, filename), result)
-                    except:  # noqa: E722
-                        logger.warning(f"Could not load file: {filename}")
+                        _parse_and_merge(futures.pop(i).result(), result)
+                    except (OSError, yaml.YAMLError) as e:
+                        if not walked:
+                            raise
+                        logger.warning(
+                            "Could not load file: %s (%s)",
+                            os.path.basename(file_path),
+                            e,
+                        )
+            except BaseException:
+                # Do not wait for queued reads when loading is aborted
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+    finally:
+        _duplicates_cache.reset(token)
     return result
 
 
-def _items_would_merge(item1: dict[str, Any], item2: dict[str, Any]) -> bool:
+def _walk_files(path: str | Path) -> Iterator[os.DirEntry[str]]:
+    """Recursively yield the files below a directory.
+
+    Files are yielded in the same order as os.walk() (files of a directory
+    before the contents of its subdirectories), directly from os.scandir()
+    entries without building intermediate path lists. Symlinked directories
+    are not followed and unreadable directories are skipped.
+
+    Args:
+        path: Directory to walk
+
+    Yields:
+        Directory entries of all files
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs: list[str] = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            yield entry
+        elif not entry.is_symlink():
+            subdirs.append(entry.path)
+    for subdir in subdirs:
+        yield from _walk_files(subdir)
+
+
+def _file_size(entry: os.DirEntry[str]) -> int:
+    """Get the size of a directory entry's file.
+
+    Args:
+        entry: Directory entry of a file
+
+    Returns:
+        File size in bytes, 0 if it cannot be determined
+    """
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
+def _is_yaml_file(path: str | Path) -> bool:
+    """Check if a path has a YAML file suffix.
+
+    Args:
+        path: File path or name
+
+    Returns:
+        True if the suffix is .yaml or .yml, False otherwise
+    """
+    return os.path.splitext(path)[1] in (".yaml", ".yml")
+
+
+def _read_file(file_path: str | Path) -> bytes:
+    """Read the raw content of a YAML file.
+
+    The content is not decoded here, the YAML reader detects the encoding
+    and decodes it while parsing.
+
+    Args:
+        file_path: Path of the file to read
+
+    Returns:
+        File content
+    """
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def _items_would_merge(prims1: dict[str, Any], item2: dict[str, Any]) -> bool:
     """Check if two dict items would merge based on primitive field matching.
 
     Args:
-        item1: First dict item
+        prims1: Primitives of the first dict item, see _extract_primitives()
         item2: Second dict item
 
     Returns:
@@ -242,9 +483,7 @@ def _items_would_merge(item1: dict[str, Any], item2: dict[str, Any]) -> bool:
         - Ignores dict and list fields for matching
     """
     comparison = False
-    for k, v1 in item1.items():
-        if isinstance(v1, dict | list):
-            continue
+    for k, v1 in prims1.items():
         if k not in item2:
             continue
         v2 = item2[k]
@@ -268,11 +507,49 @@ def _extract_primitives(item: dict[str, Any]) -> dict[str, Any]:
     return {k: v for k, v in item.items() if not isinstance(v, dict | list)}
 
 
-def _has_duplicates_in_list(items: list[Any]) -> bool:
+def _primitives_match(prims1: dict[str, Any], prims2: dict[str, Any]) -> bool:
+    """Check if two primitive dicts share at least one key and agree on all shared keys.
+
+    Args:
+        prims1: Primitives of the first dict item
+        prims2: Primitives of the second dict item
+
+    Returns:
+        True if items would merge, False otherwise
+
+    Note:
+        This is the innermost comparison of list merging. An explicit loop with
+        early exit avoids the generator overhead of ``all()``.
+    """
+    shared_keys = prims1.keys() & prims2.keys()
+    if not shared_keys:
+        return False
+    for k in shared_keys:
+        if prims1[k] != prims2[k]:
+            return False
+    return True
+
+
+def _list_primitives(items: list[Any]) -> list[dict[str, Any] | None]:
+    """Extract the primitives of all dict items of a list.
+
+    Args:
+        items: List to extract primitives from
+
+    Returns:
+        Primitives per list item, None for non-dict items
+    """
+    return [_extract_primitives(i) if isinstance(i, dict) else None for i in items]
+
+
+def _has_duplicates_in_list(
+    items: list[Any], primitives: list[dict[str, Any] | None] | None = None
+) -> bool:
     """Check if a list contains duplicate dict items using an inverted index.
 
     Args:
         items: List to check for duplicates
+        primitives: Optional precomputed result of _list_primitives(items)
 
     Returns:
         True if list contains matching dict items, False otherwise
@@ -280,125 +557,263 @@ def _has_duplicates_in_list(items: list[Any]) -> bool:
     Note:
         Uses same matching logic as merge_list_item() to determine if items are duplicates.
         Primitive items (strings, numbers) are not considered for duplicate detection.
+
+        While load_yaml_files() runs, results are cached per list object and
+        reused as long as the list length is unchanged.
+
+        Every dict item is looked up in a _MatchIndex over the items before it,
+        so candidates come from the (key, value) buckets of the item and large
+        buckets are skipped where a smaller bucket covers them.
     """
-    # Only check dict items for duplicates, precompute primitives
-    dict_items: list[dict[str, Any]] = []
-    primitives_list: list[dict[str, Any]] = []
-    for item in items:
-        if isinstance(item, dict):
-            dict_items.append(item)
-            primitives_list.append(_extract_primitives(item))
-
-    if len(dict_items) < 2:
-        return False
+    cached = _cached_duplicates(items)
+    if cached is not None:
+        return cached
+    if primitives is None:
+        primitives = _list_primitives(items)
+    result = _scan_for_duplicates(primitives)
+    cache = _duplicates_cache.get()
+    if cache is not None:
+        cache[id(items)] = (items, len(items), result)
+    return result
 
-    # Build inverted index: (key, value) -> [indices]
-    index: dict[tuple[str, Any], list[int]] = defaultdict(list)
-    for i, prims in enumerate(primitives_list):
-        for k, v in prims.items():
-            try:
-                index[(k, v)].append(i)
-            except TypeError:
-                continue
 
-    # Check candidate pairs from buckets with 2+ entries
-    checked: set[tuple[int, int]] = set()
-    for bucket in index.values():
-        if len(bucket) < 2:
-            continue
-        for bi in range(len(bucket)):
-            for bj in range(bi + 1, len(bucket)):
-                idx_pair = (bucket[bi], bucket[bj])
-                if idx_pair in checked:
-                    continue
-                checked.add(idx_pair)
-                i, j = idx_pair
-                # Intersect primitive key sets, verify all shared keys match
-                shared_keys = primitives_list[i].keys() & primitives_list[j].keys()
-                if not shared_keys:
-                    continue
-                if all(
-                    primitives_list[i][k] == primitives_list[j][k] for k in shared_keys
-                ):
-                    return True
+def _cached_duplicates(items: list[Any]) -> bool | None:
+    """Look up the cached duplicate check result of a list.
 
-    return False
+    Args:
+        items: List to look up
 
+    Returns:
+        Cached result of _has_duplicates_in_list(), None if not cached or stale
+    """
+    cache = _duplicates_cache.get()
+    if cache is not None:
+        cached = cache.get(id(items))
+        if cached is not None and cached[0] is items and cached[1] == len(items):
+            return cached[2]
+    return None
 
-def _merge_list_items_indexed(
-    source_items: list[Any], destination: list[Any], deduplicate: bool
-) -> None:
-    """Merge source items into destination list using an inverted index.
+
+def _scan_for_duplicates(primitives: list[dict[str, Any] | None]) -> bool:
+    """Scan list item primitives for duplicates, see _has_duplicates_in_list().
 
     Args:
-        source_items: List of items to merge into destination
-        destination: Target list (modified in-place)
-        deduplicate: When True, merges matching dict items
+        primitives: Primitives per list item, None for non-dict items
+
+    Returns:
+        True if any two dict items match, False otherwise
     """
-    # Build inverted index over destination's dict items
-    dest_primitives: list[dict[str, Any] | None] = []
-    for item in destination:
-        if isinstance(item, dict):
-            dest_primitives.append(_extract_primitives(item))
-        else:
-            dest_primitives.append(None)
+    # Look up every item among the items before it
+    index = _MatchIndex([])
+    for prims in primitives:
+        if prims and index.find(prims) is not None:
+            return True
+        index.primitives.append(prims)
+        index.add(len(index.primitives) - 1)
+    return False
 
-    index: dict[tuple[str, Any], list[int]] = defaultdict(list)
-    for i, prims in enumerate(dest_primitives):
-        if prims is None:
-            continue
+
+class _MatchIndex:
+    """Index over list item primitives to find the first item matching an item.
+
+    Candidates are collected from an inverted index mapping (key, value) pairs
+    to the items having them, like a plain scan would find them. A large
+    bucket, e.g. for a value shared by most items like ``mode: access``, is
+    skipped when all of its items also have another key of the looked up item
+    whose bucket is small: any match in the large bucket must then also be in
+    the small one. Only large buckets that cannot be skipped are scanned.
+
+    Attributes:
+        primitives: Primitives per list item, None for non-dict items
+        buckets: Item indices per hashable (key, value) pair
+        unhashable: Indices of items with unhashable primitive values, which
+            are candidates for every lookup
+        key_counts: Per large bucket, the number of its items having each key
+    """
+
+    # Buckets with more items are only scanned if they cannot be skipped
+    LARGE_BUCKET = 16
+
+    def __init__(self, primitives: list[dict[str, Any] | None]):
+        """Initialize the index over all items with primitives.
+
+        Args:
+            primitives: Primitives per list item, kept by reference
+        """
+        self.primitives = primitives
+        self.buckets: dict[tuple[str, Any], dict[int, None]] = {}
+        self.unhashable: dict[int, None] = {}
+        self.key_counts: dict[tuple[str, Any], dict[str, int]] = {}
+        for i in range(len(primitives)):
+            self.add(i)
+
+    def find(self, prims: dict[str, Any]) -> int | None:
+        """Find the first item matching the given primitives.
+
+        Args:
+            prims: Primitives of the item to look up
+
+        Returns:
+            Index of the first matching item, None if no item matches
+        """
+        small: list[dict[int, None]] = []
+        large: list[tuple[tuple[str, Any], dict[int, None]]] = []
+        # Keys of the looked up item whose bucket is scanned or empty
+        scanned_keys: set[str] = set()
         for k, v in prims.items():
             try:
-                index[(k, v)].append(i)
+                bucket = self.buckets.get((k, v))
             except TypeError:
                 continue
+            if bucket is None or len(bucket) <= self.LARGE_BUCKET:
+                scanned_keys.add(k)
+                if bucket:
+                    small.append(bucket)
+            else:
+                large.append(((k, v), bucket))
+
+        candidates: list[dict[int, None]] = [*small, self.unhashable]
+        for bucket_key, bucket in large:
+            key_counts = self.key_counts.get(bucket_key)
+            if key_counts is None:
+                key_counts = self.key_counts[bucket_key] = defaultdict(int)
+                for i in bucket:
+                    for k in self.primitives[i] or {}:
+                        key_counts[k] += 1
+            if not any(key_counts.get(k) == len(bucket) for k in scanned_keys):
+                candidates.append(bucket)
+
+        match: int | None = None
+        for bucket in candidates:
+            for i in bucket:
+                if match is not None and i >= match:
+                    continue
+                prims_i = self.primitives[i]
+                if prims_i and _primitives_match(prims, prims_i):
+                    match = i
+        return match
 
-    for source_item in source_items:
-        if not isinstance(source_item, dict):
-            destination.append(source_item)
-            continue
+    def add(self, i: int) -> None:
+        """Index an item, after it was appended or its primitives changed.
 
-        src_prims = _extract_primitives(source_item)
-        if not src_prims:
-            destination.append(source_item)
-            continue
-
-        # Collect candidate dest indices
-        candidate_set: set[int] = set()
-        for k, v in src_prims.items():
+        Args:
+            i: Index of the item
+        """
+        prims = self.primitives[i]
+        if not prims:
+            return
+        for k, v in prims.items():
             try:
-                bucket = index.get((k, v))
-                if bucket:
-                    candidate_set.update(bucket)
+                bucket = self.buckets.setdefault((k, v), {})
             except TypeError:
+                self.unhashable[i] = None
                 continue
+            bucket[i] = None
+            key_counts = self.key_counts.get((k, v))
+            if key_counts is not None:
+                for key in prims:
+                    key_counts[key] += 1
 
-        # Check candidates in destination order (first-match semantics)
-        matched = False
-        for ci in sorted(candidate_set):
-            dp = dest_primitives[ci]
-            if dp is None:
+    def remove(self, i: int) -> None:
+        """Remove an item from the index, before its primitives change.
+
+        Args:
+            i: Index of the item
+        """
+        prims = self.primitives[i]
+        if not prims:
+            return
+        self.unhashable.pop(i, None)
+        for k, v in prims.items():
+            try:
+                bucket = self.buckets[(k, v)]
+            except TypeError:
                 continue
-            shared_keys = src_prims.keys() & dp.keys()
-            if not shared_keys:
+            del bucket[i]
+            if not bucket:
+                del self.buckets[(k, v)]
+                self.key_counts.pop((k, v), None)
                 continue
-            if all(src_prims[k] == dp[k] for k in shared_keys):
-                merge_dict(source_item, destination[ci], deduplicate)
-                # Update primitives cache after merge
-                dest_primitives[ci] = _extract_primitives(destination[ci])
-                matched = True
-                break
-
-        if not matched:
-            # Append and update index so later source items can match
-            new_idx = len(destination)
+            key_counts = self.key_counts.get((k, v))
+            if key_counts is not None:
+                for key in prims:
+                    key_counts[key] -= 1
+
+
+def _extend_with_duplicates(source_items: list[Any], destination: list[Any]) -> None:
+    """Concatenate source items when either list contains duplicates.
+
+    Appending never removes existing duplicates, so the destination is
+    recorded as containing duplicates and is not rescanned by the next merge.
+
+    Args:
+        source_items: List of items to append
+        destination: Target list (modified in-place)
+    """
+    destination.extend(source_items)
+    cache = _duplicates_cache.get()
+    if cache is not None:
+        cache[id(destination)] = (destination, len(destination), True)
+
+
+def _merge_list_items_indexed(
+    source_items: list[Any],
+    destination: list[Any],
+    deduplicate: bool,
+    pending: deque[tuple[dict[str, Any], dict[str, Any]]],
+) -> None:
+    """Merge source items into destination list using a match index.
+
+    If either list contains duplicates, source items are concatenated instead.
+    The primitives of every item are extracted once and shared between the
+    duplicate checks and the index used for merging.
+
+    Args:
+        source_items: List of items to merge into destination
+        destination: Target list (modified in-place)
+        deduplicate: When True, merges matching dict items
+        pending: Queue receiving nested (source, destination) dicts to merge
+    """
+    # If duplicates exist in either list, skip merging to preserve them
+    source_primitives = _list_primitives(source_items)
+    if _has_duplicates_in_list(source_items, source_primitives):
+        _extend_with_duplicates(source_items, destination)
+        return
+    # A destination known to contain duplicates needs no primitives
+    if _cached_duplicates(destination):
+        _extend_with_duplicates(source_items, destination)
+        return
+    dest_primitives = _list_primitives(destination)
+    if _has_duplicates_in_list(destination, dest_primitives):
+        _extend_with_duplicates(source_items, destination)
+        return
+
+    index = _MatchIndex(dest_primitives)
+    for source_item, src_prims in zip(source_items, source_primitives, strict=True):
+        if not src_prims:
             destination.append(source_item)
             dest_primitives.append(src_prims)
-            for k, v in src_prims.items():
-                try:
-                    index[(k, v)].append(new_idx)
-                except TypeError:
-                    continue
+            continue
+
+        ci = index.find(src_prims)
+        if ci is not None:
+            _merge_dict_level(source_item, destination[ci], deduplicate, pending)
+            # Re-index the item if the merge changed its primitives
+            prims = _extract_primitives(destination[ci])
+            if prims != dest_primitives[ci]:
+                index.remove(ci)
+                dest_primitives[ci] = prims
+                index.add(ci)
+        else:
+            # Append and index so later source items can match
+            destination.append(source_item)
+            dest_primitives.append(src_prims)
+            index.add(len(destination) - 1)
+
+    # Merged items may change without the list length changing
+    cache = _duplicates_cache.get()
+    if cache is not None:
+        cache.pop(id(destination), None)
 
 
 def merge_list_item(
@@ -437,10 +852,9 @@ def merge_list_item(
     """
     if isinstance(source_item, dict):
         # check if we have an item in destination with matching primitives
+        src_prims = _extract_primitives(source_item)
         for dest_item in destination:
-            if isinstance(dest_item, dict) and _items_would_merge(
-                source_item, dest_item
-            ):
+            if isinstance(dest_item, dict) and _items_would_merge(src_prims, dest_item):
                 merge_dict(source_item, dest_item, deduplicate)
                 return
     destination.append(source_item)
@@ -481,44 +895,71 @@ def merge_dict(
         merge_dict(source, dest, deduplicate=True)
         # Result: {"list": [{"name": "a", "y": 2}, {"name": "a"}, {"name": "a"}]}
     """
+    # Nested dicts are merged breadth-first from a FIFO queue instead of
+    # recursively, which keeps the order of writes to each destination dict
+    pending: deque[tuple[dict[str, Any], dict[str, Any]]] = deque()
+    pending.append((source, destination))
+    while pending:
+        _merge_dict_level(*pending.popleft(), deduplicate, pending)
+    return destination
+
+
+def _merge_dict_level(
+    source: dict[str, Any],
+    destination: dict[str, Any],
+    deduplicate: bool,
+    pending: deque[tuple[dict[str, Any], dict[str, Any]]],
+) -> None:
+    """Merge the top level of source into destination, see merge_dict().
+
+    Args:
+        source: Source dictionary to merge from
+        destination: Destination dictionary to merge into (modified in-place)
+        deduplicate: When True, list items are merged intelligently
+        pending: Queue receiving nested (source, destination) dicts to merge
+    """
     if not source:
-        return destination
+        return
+    if not destination and isinstance(source, dict):
+        # Every key would be copied as is
+        destination.update(source)
+        return
     for key, value in source.items():
-        if key not in destination or destination[key] is None:
+        # Missing keys and None values are treated the same, one lookup covers both
+        existing = destination.get(key)
+        if existing is None:
             destination[key] = value
         elif isinstance(value, dict):
-            if isinstance(destination[key], dict):
-                merge_dict(value, destination[key], deduplicate)
+            if isinstance(existing, dict):
+                pending.append((value, existing))
         elif isinstance(value, list):
-            if isinstance(destination[key], list):
+            if isinstance(existing, list):
                 if deduplicate:
                     # Skip empty lists
-                    if not value or not destination[key]:
-                        destination[key] += value
-                    # Check if either source or destination list has duplicates
-                    # If duplicates exist, skip merging to preserve them
-                    elif _has_duplicates_in_list(value) or _has_duplicates_in_list(
-                        destination[key]
-                    ):
-                        # Concatenate without merging to preserve all duplicates
-                        destination[key] += value
+                    if not value or not existing:
+                        existing.extend(value)
                     else:
-                        # No duplicates: merge matching items across files
-                        _merge_list_items_indexed(value, destination[key], deduplicate)
+                        # Merge matching items unless either list has duplicates
+                        _merge_list_items_indexed(value, existing, deduplicate, pending)
                 else:
                     # Simple append (original behavior)
-                    destination[key] += value
+                    existing.extend(value)
         elif value is not None:
             destination[key] = value
-    return destination
 
 
-def write_yaml_file(data: dict[str, Any], path: Path) -> None:
+def write_yaml_file(data: dict[str, Any], path: Path, fast: bool = False) -> None:
     """Write data structure to a YAML file with standard formatting.
 
     Args:
         data: Dictionary to write as YAML
         path: Path to output file
+        fast: When True, uses ruamel's safe dumper with the LibYAML based C emitter
+              if ``ruamel.yaml.clib`` is installed, which is significantly faster.
+              Only speeds up plain Python types (e.g. loaded with ``typ="safe"``),
+              round-trip loaded data is written with the round-trip dumper. Does
+              not support the sequence offset, so sequence items are not
+              indented relative to their parent key.
 
     Formatting:
         - Explicit document start (---)
@@ -543,10 +984,35 @@ def write_yaml_file(data: dict[str, Any], path: Path) -> None:
     """
     try:
         with open(path, "w") as fh:
-            y = yaml.YAML()
-            y.explicit_start = True
-            y.default_flow_style = False
-            y.indent(mapping=2, sequence=4, offset=2)
-            y.dump(data, fh)
+            try:
+                _yaml_dumper(fast).dump(data, fh)
+            except yaml.representer.RepresenterError:
+                if not fast:
+                    raise
+                # Round-trip loaded data (CommentedMap, ScalarString, ...) is not
+                # supported by the safe dumper, write it with the round-trip dumper
+                fh.seek(0)
+                fh.truncate()
+                _yaml_dumper(False).dump(data, fh)
     except:  # noqa: E722
-        logger.error(f"Cannot write file: {path}")
+        logger.error("Cannot write file: %s", path)
+
+
+def _yaml_dumper(fast: bool) -> yaml.YAML:
+    """Create a YAML dumper with the formatting of write_yaml_file().
+
+    Args:
+        fast: When True, creates ruamel's safe dumper instead of the round-trip dumper
+
+    Returns:
+        Configured YAML instance
+    """
+    y = yaml.YAML(typ="safe", pure=False) if fast else yaml.YAML()
+    y.explicit_start = True
+    y.default_flow_style = False
+    y.indent(mapping=2, sequence=4, offset=2)
+    if fast:
+        # Accessing the representer creates it with the options set above
+        # Keep insertion order like the round-trip dumper
+        y.representer.sort_base_mapping_type_on_output = False
+    return y
@@ -3,10 +3,13 @@
 
 import filecmp
 import os
+import time
 from pathlib import Path
 from typing import Any
 
 import pytest
+from ruamel import yaml as ruamel_yaml
+from ruamel.yaml import YAMLError
 
 from nac_yaml import yaml
 
@@ -21,6 +24,14 @@ def _is_only_dict_list_tree(value: Any) -> bool:
     return True
 
 
+def _optional_attributes_item(name: str, value: Any) -> dict[str, Any]:
+    # One of 256 primitive key sets, chosen by the bits of the name's number
+    number = int(name[1:])
+    item = {"name": name}
+    item.update({f"k{bit}": value for bit in range(8) if number >> bit & 1})
+    return item
+
+
 @pytest.mark.parametrize("typ", [None, "rt", "safe"])
 def test_load_yaml_files(tmpdir: Path, typ: str | None) -> None:
     input_path_1 = Path("tests/unit/fixtures/data_merge/file1.yaml")
@@ -61,6 +72,145 @@ def test_load_yaml_files(tmpdir: Path, typ: str | None) -> None:
     assert data["root"]["children"][0]["name"] == "DEF"
 
 
+def test_load_yaml_files_vault_cli_fallback(mocker: Any) -> None:
+    find_spec = yaml.importlib.util.find_spec
+    mocker.patch.object(
+        yaml.importlib.util,
+        "find_spec",
+        side_effect=lambda name: None if name == "ansible" else find_spec(name),
+    )
+    input_path = Path("tests/unit/fixtures/data_vault/")
+    os.environ["ANSIBLE_VAULT_ID"] = "dev"
+    os.environ["ANSIBLE_VAULT_PASSWORD"] = "Password123"
+    data = yaml.load_yaml_files([input_path])
+    assert data["root"]["children"][0]["name"] == "ABC\n"
+
+
+def test_load_yaml_files_vault_secret_loaded_once(tmpdir: Path, mocker: Any) -> None:
+    vault_data = Path("tests/unit/fixtures/data_vault/data.yaml").read_text()
+    for i in range(3):
+        Path(tmpdir, f"data{i}.yaml").write_text(vault_data.replace("root", f"root{i}"))
+    os.environ["ANSIBLE_VAULT_ID"] = "dev"
+    os.environ["ANSIBLE_VAULT_PASSWORD"] = "Password123"
+    vault = pytest.importorskip("ansible.parsing.vault")
+    get_file_vault_secret = mocker.spy(vault, "get_file_vault_secret")
+
+    data = yaml.load_yaml_files([Path(tmpdir)])
+    assert [data[f"root{i}"]["children"][0]["name"] for i in range(3)] == ["ABC\n"] * 3
+    assert get_file_vault_secret.call_count == 1
+
+
+def test_vault_tag_from_yaml_returns_decrypted_string() -> None:
+    os.environ["ANSIBLE_VAULT_ID"] = "dev"
+    os.environ["ANSIBLE_VAULT_PASSWORD"] = "Password123"
+    y = ruamel_yaml.YAML(typ="safe")
+    y.register_class(yaml.VaultTag)
+    data = y.load(Path("tests/unit/fixtures/data_vault/data.yaml"))
+    assert data["root"]["children"][0]["name"] == "ABC\n"
+
+    # Other loaders are unaffected by the deferred decryption of load_yaml_files()
+    yaml.load_yaml_files([Path("tests/unit/fixtures/data_vault/")], typ="safe")
+    data = y.load(Path("tests/unit/fixtures/data_vault/data.yaml"))
+    assert data["root"]["children"][0]["name"] == "ABC\n"
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(b"root: [\n", id="malformed"),
+        pytest.param(b"- hosts: all\n", id="top_level_list"),
+        pytest.param(b"scalar\n", id="top_level_scalar"),
+        pytest.param(b"\xff\xfe\x00\xd8garbage", id="garbage_behind_bom"),
+    ],
+)
+def test_load_yaml_files_skips_unloadable_files(tmpdir: Path, content: bytes) -> None:
+    Path(tmpdir, "invalid.yaml").write_bytes(content)
+    Path(tmpdir, "valid.yaml").write_text("root: value\n")
+
+    data = yaml.load_yaml_files([Path(tmpdir)])
+    assert data == {"root": "value"}
+
+    with pytest.raises(YAMLError):
+        yaml.load_yaml_files([Path(tmpdir, "invalid.yaml")])
+
+
+def test_write_yaml_file_fast(tmpdir: Path) -> None:
+    input_path_1 = Path("tests/unit/fixtures/data_merge/file1.yaml")
+    input_path_2 = Path("tests/unit/fixtures/data_merge/file2.yaml")
+    output_path = Path(tmpdir, "output.yaml")
+
+    # Without ruamel.yaml.clib the pure Python emitter applies the sequence offset
+    if ruamel_yaml.YAML(typ="safe", pure=False).Emitter.__name__ == "CEmitter":
+        result_path = Path("tests/unit/fixtures/data_merge/result_fast.yaml")
+    else:
+        result_path = Path("tests/unit/fixtures/data_merge/result.yaml")
+
+    data = yaml.load_yaml_files([input_path_1, input_path_2], typ="safe")
+    yaml.write_yaml_file(data, output_path, fast=True)
+    assert filecmp.cmp(output_path, result_path, shallow=False)
+
+    # Round-trip containers fall back to the round-trip dumper
+    result_path = Path("tests/unit/fixtures/data_merge/result.yaml")
+    data = yaml.load_yaml_files([input_path_1, input_path_2])
+    yaml.write_yaml_file(data, output_path, fast=True)
+    assert filecmp.cmp(output_path, result_path, shallow=False)
+
+
+def test_load_yaml_files_keeps_file_order(tmpdir: Path) -> None:
+    small_path = Path(tmpdir, "small.yaml")
+    small_path.write_text("key: small\n")
+    large_path = Path(tmpdir, "large.yaml")
+    large_path.write_text("key: large\n" + "".join(f"k{i}: {i}\n" for i in range(1000)))
+
+    data = yaml.load_yaml_files([small_path, large_path])
+    assert data["key"] == "large"
+
+    data = yaml.load_yaml_files([large_path, small_path])
+    assert data["key"] == "small"
+
+
+def test_load_yaml_files_caches_duplicate_checks(tmpdir: Path, mocker: Any) -> None:
+    paths = []
+    for i, items in enumerate(
+        ["[{a: 1}, {b: 2}]", "[{a: 1, b: 2}]", "[{a: 1, c: 3}]", "[{a: 1, d: 4}]"]
+    ):
+        paths.append(Path(tmpdir, f"file{i}.yaml"))
+        paths[-1].write_text(f"list: {items}\n")
+    scan_for_duplicates = mocker.spy(yaml, "_scan_for_duplicates")
+    list_primitives = mocker.spy(yaml, "_list_primitives")
+
+    data = yaml.load_yaml_files(paths, typ="safe")
+    # The second file merges into {a: 1}, which then matches {b: 2}, so the
+    # stale result of the first scan must not be reused for the third file
+    assert data["list"] == [
+        {"a": 1, "b": 2},
+        {"b": 2},
+        {"a": 1, "c": 3},
+        {"a": 1, "d": 4},
+    ]
+    # The destination is rescanned for the second and third file, but is known
+    # to contain duplicates for the fourth one
+    assert scan_for_duplicates.call_count == 5
+    assert list_primitives.call_count == 5
+
+
+def test_load_yaml_files_reads_ahead_boundedly(tmpdir: Path, mocker: Any) -> None:
+    for i in range(500):
+        Path(tmpdir, f"file{i:03}.yaml").write_text(f"key: {i}\nkey{i}: {i}\n")
+    invalid_path = Path(tmpdir, "invalid.yml")
+    invalid_path.write_text("root: [\n")
+
+    data = yaml.load_yaml_files([Path(tmpdir)])
+    last_file = [name for name in os.listdir(tmpdir) if name.endswith(".yaml")][-1]
+    assert data["key"] == int(last_file[4:7])
+    assert len(data) == 501
+
+    read_file = mocker.spy(yaml, "_read_file")
+    with pytest.raises(YAMLError):
+        yaml.load_yaml_files([invalid_path, Path(tmpdir)])
+    assert read_file.call_count < 500
+
+
 @pytest.mark.parametrize(
     "source,destination,expected,deduplicate",
     [
@@ -127,6 +277,64 @@ def test_load_yaml_files(tmpdir: Path, typ: str | None) -> None:
             True,
             id="merge_when_deduplicating_lists_deduplicate_true",
         ),
+        pytest.param(
+            {"list": [{"name": "a", "x": 1}, {"name": "a", "y": 2}]},
+            {"list": [{"name": "a", "z": 3}]},
+            {
+                "list": [
+                    {"name": "a", "z": 3},
+                    {"name": "a", "x": 1},
+                    {"name": "a", "y": 2},
+                ]
+            },
+            True,
+            id="append_when_source_has_duplicates_with_different_keys",
+        ),
+        pytest.param(
+            {"list": [{"name": "a", "x": 1}, {"name": "b", "x": 1}]},
+            {"list": [{"name": "a", "y": 2}]},
+            {"list": [{"name": "a", "y": 2, "x": 1}, {"name": "b", "x": 1}]},
+            True,
+            id="merge_when_items_share_only_some_primitive_values",
+        ),
+        pytest.param(
+            {"list": ["abc", {"name": "b", "x": 2}, {"name": "b", "x": 1}]},
+            {"list": [{"name": "a"}]},
+            {
+                "list": [
+                    {"name": "a"},
+                    "abc",
+                    {"name": "b", "x": 2},
+                    {"name": "b", "x": 1},
+                ]
+            },
+            True,
+            id="merge_lists_with_mixed_primitive_and_dict_items",
+        ),
+        pytest.param(
+            {"list": [{"name": "b", "mode": "access", "vlan": 10}]},
+            {
+                "list": [
+                    {"name": "a", "mode": "access"},
+                    {"name": "b", "mode": "access"},
+                ]
+            },
+            {
+                "list": [
+                    {"name": "a", "mode": "access"},
+                    {"name": "b", "mode": "access", "vlan": 10},
+                ]
+            },
+            True,
+            id="merge_into_item_matching_all_shared_primitives",
+        ),
+        pytest.param(
+            {"list": [{"name": "a", "id": 1}]},
+            {"list": [{"name": "a"}, {"id": 1}]},
+            {"list": [{"name": "a", "id": 1}, {"id": 1}]},
+            True,
+            id="merge_into_first_matching_item",
+        ),
         pytest.param(
             {
                 "switch_link_aggregations": [
@@ -164,6 +372,68 @@ def test_merge_dict(
     assert destination == expected
 
 
+def test_merge_dict_rejects_non_mapping_source() -> None:
+    destination: dict[str, Any] = {}
+    with pytest.raises(AttributeError):
+        yaml.merge_dict(["ab", "cd"], destination)  # type: ignore[arg-type]
+    assert destination == {}
+
+
+@pytest.mark.parametrize(
+    "source_items,destination_items,expected_length",
+    [
+        pytest.param(
+            [{"name": f"n{i}", "vlan": i} for i in range(4000)],
+            [{"name": f"n{i}"} for i in range(4000)],
+            4000,
+            id="merge_adds_primitive_attribute",
+        ),
+        pytest.param(
+            [{"name": f"m{i}", "mode": "access"} for i in range(4000)],
+            [{"name": f"n{i}", "mode": "access"} for i in range(4000)],
+            8000,
+            id="value_shared_by_all_items",
+        ),
+        pytest.param(
+            [_optional_attributes_item(f"m{i}", i) for i in range(3000)],
+            [_optional_attributes_item(f"n{i}", i) for i in range(3000)],
+            6000,
+            id="optional_attributes",
+        ),
+    ],
+)
+def test_merge_dict_large_lists(
+    source_items: list[Any], destination_items: list[Any], expected_length: int
+) -> None:
+    destination = {"list": destination_items}
+    start = time.perf_counter()
+    yaml.merge_dict({"list": source_items}, destination)
+    # A quadratic list merge takes several seconds for these sizes
+    assert time.perf_counter() - start < 1
+    assert len(destination["list"]) == expected_length
+    assert destination["list"][:2] == destination_items[:2]
+
+
+@pytest.mark.parametrize("value", [True, "distinct"])
+def test_has_duplicates_in_list_heterogeneous_key_sets(value: Any) -> None:
+    items = [
+        _optional_attributes_item(f"n{i}", i if value == "distinct" else value)
+        for i in range(4000)
+    ]
+    start = time.perf_counter()
+    assert not yaml._has_duplicates_in_list(items)
+    assert time.perf_counter() - start < 1
+
+    items.append({"name": "n7", "k0": items[7]["k0"]})
+    assert yaml._has_duplicates_in_list(items)
+
+
+def test_load_yaml_files_skips_top_level_list_file(tmpdir: Path) -> None:
+    Path(tmpdir, "list.yaml").write_text("- ab\n- cd\n")
+
+    assert yaml.load_yaml_files([Path(tmpdir)]) == {}
+
+
 @pytest.mark.parametrize(
     "source_item,destination,expected",
     [